@@ -0,0 +1,164 @@
+"""Action plugin for configuring postfix in a single pass."""
+
+import re
+
+from ansible.plugins.action import ActionBase
+from ansible.utils.display import Display
+from ansible_collections.network_automation_labs.devops.plugins.filter.postfix_filters import (
+    postfix_relay_host,
+)
+from ansible_collections.network_automation_labs.devops.plugins.module_utils.common import (
+    ActionPluginMixin,
+)
+
+display = Display()
+
+MAIN_CF = "/etc/postfix/main.cf"
+ALIASES = "/etc/aliases"
+SASL_PASSWD = "/etc/postfix/sasl_passwd"
+
+SASL_CONFIG = {
+    "smtp_sasl_auth_enable": "yes",
+    "smtp_sasl_password_maps": f"hash:{SASL_PASSWD}",
+    "smtp_sasl_security_options": "noanonymous",
+}
+
+# Parameters that `postfix reload` does not apply to the running master
+RESTART_PARAMETERS = {
+    "inet_interfaces",
+    "inet_protocols",
+    "master_service_disable",
+}
+
+
+def update_main_cf(content, config):
+    """Apply `config` to the main.cf `content`.
+
+    Existing parameters are replaced in place (including any continuation
+    lines), missing parameters are appended.
+
+    Returns:
+        tuple[str, set[str]]: The new content and the names of the parameters
+            whose value changed.
+
+    """
+    pending = {key: str(value) for key, value in config.items()}
+    changed = set()
+    lines = []
+    current = None
+    for line in content.splitlines():
+        if current is not None and line[:1].isspace():
+            continue
+        current = None
+        match = re.match(r"^(\w+)\s*=\s*(.*)$", line)
+        if match and match.group(1) in config:
+            key = match.group(1)
+            current = key
+            if key not in pending:
+                # duplicate definition, the replacement has already been written
+                changed.add(key)
+                continue
+            value = pending.pop(key)
+            if match.group(2).strip() != value:
+                changed.add(key)
+            lines.append(f"{key} = {value}")
+            continue
+        lines.append(line)
+
+    for key, value in pending.items():
+        changed.add(key)
+        lines.append(f"{key} = {value}")
+
+    return "\n".join(lines) + "\n", changed
+
+
+def render_aliases(aliases):
+    """Render the /etc/aliases file."""
+    lines = ["# Ansible Managed"]
+    for user, targets in aliases.items():
+        lines.append(f"{user}: {', '.join(targets)}")
+    return "\n".join(lines) + "\n"
+
+
+def render_sasl_passwd(relay):
+    """Render the /etc/postfix/sasl_passwd file."""
+    auth = relay["auth"]
+    return (
+        "# Ansible Managed\n"
+        f"{postfix_relay_host(relay)}   {auth.get('username', '')}:{auth['password']}\n"
+    )
+
+
+class ActionModule(ActionPluginMixin, ActionBase):
+    def run(self, tmp=None, task_vars=None):
+        result = super().run(tmp, task_vars)
+        result["changed"] = False
+        _, module_args = self.validate_argument_spec(
+            argument_spec={
+                "config": {"type": "dict", "required": True},
+                "aliases": {"type": "dict", "required": False, "default": {}},
+                "relay": {"type": "dict", "required": False},
+            },
+        )
+        config = module_args["config"]
+        relay = module_args["relay"] or {}
+        files = [
+            {
+                "dest": ALIASES,
+                "content": render_aliases(module_args["aliases"]),
+                "mode": "0600",
+            },
+        ]
+        if relay.get("auth"):
+            config = {**config, **SASL_CONFIG}
+            files.append(
+                {
+                    "dest": SASL_PASSWD,
+                    "content": render_sasl_passwd(relay),
+                    "mode": "0600",
+                }
+            )
+
+        main_cf, _ = self.load_file_if_exists(task_vars, MAIN_CF, "")
+        main_cf, changed_parameters = update_main_cf(main_cf, config)
+        files.append({"dest": MAIN_CF, "content": main_cf, "mode": "0644"})
+
+        bundle = self.transfer_files(task_vars, files)
+        changed_files = set(bundle["stale"]) | set(bundle["updated"])
+        result["changed"] = bundle["changed"]
+        result["changed_files"] = sorted(changed_files)
+        result["changed_parameters"] = sorted(changed_parameters)
+
+        commands = []
+        if ALIASES in changed_files:
+            commands.append(["newaliases"])
+        if SASL_PASSWD in changed_files:
+            commands.append(["postmap", f"hash:{SASL_PASSWD}"])
+
+        state = None
+        if changed_parameters & RESTART_PARAMETERS:
+            state = "restarted"
+        elif MAIN_CF in changed_files or changed_parameters:
+            # rebuilt alias and hash map databases are picked up without a reload
+            state = "reloaded"
+
+        result["commands"] = [" ".join(argv) for argv in commands]
+        result["service_state"] = state
+        if self._task.check_mode:
+            return result
+
+        for argv in commands:
+            self.run_remote_module("ansible.builtin.command", task_vars, argv=argv)
+            self.display_changed(f"Ran {' '.join(argv)}")
+
+        if state is not None:
+            self.run_remote_module(
+                "ansible.builtin.service",
+                task_vars,
+                name="postfix",
+                state=state,
+                enabled=True,
+            )
+            self.display_changed(f"Postfix {state}")
+
+        return result
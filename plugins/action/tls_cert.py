@@ -0,0 +1,96 @@
+"""Action plugin for keeping a TLS key, CSR and certificate up to date."""
+
+from ansible.plugins.action import ActionBase
+from ansible.utils.display import Display
+from ansible_collections.network_automation_labs.devops.plugins.module_utils.common import (
+    ActionPluginMixin,
+)
+from ansible_collections.network_automation_labs.devops.plugins.module_utils.crypto import (
+    CryptoPluginMixin,
+    expected_subject_alt_names,
+    expires_soon,
+    normalize_subject_alt_names,
+)
+
+display = Display()
+
+
+class ActionModule(CryptoPluginMixin, ActionPluginMixin, ActionBase):
+    def needs_renewal(self, task_vars, module_args):
+        certificate = self.certificate_metadata(task_vars, module_args["path"])
+        if certificate is None:
+            return "Certificate does not exist.", None
+
+        if expires_soon(certificate["not_after"]):
+            return "Certificate expires within 30 days.", certificate
+
+        expected = expected_subject_alt_names(module_args["csr"])
+        if expected != normalize_subject_alt_names(certificate["subject_alt_name"]):
+            return "Certificate subject alternative names changed.", certificate
+
+        return None, certificate
+
+    def run(self, tmp=None, task_vars=None):
+        result = super().run(tmp, task_vars)
+        result["changed"] = False
+        _, module_args = self.validate_argument_spec(
+            argument_spec={
+                "path": {"type": "str", "required": True},
+                "chain_path": {"type": "str", "required": False},
+                "key": {"type": "dict", "required": True},
+                "csr": {"type": "dict", "required": False, "default": {}},
+                "acme_directory": {"type": "str", "required": True},
+                "acme_account_email": {"type": "str", "required": True},
+                "acme_account_key": {"type": "str", "required": True},
+                "dns_provider": {"type": "dict", "required": True},
+            },
+        )
+
+        reason, certificate = self.needs_renewal(task_vars, module_args)
+        if reason is None:
+            self.display_ok("Certificate is valid.")
+            return result
+
+        self.display_changed(reason)
+        if self._task.diff:
+            result["diff"] = self.certificate_diff(
+                certificate,
+                expected_subject_alt_names(module_args["csr"]),
+                module_args["path"],
+            )
+        if self._task.check_mode:
+            result["changed"] = True
+            return result
+
+        # a new key is deployed together with the certificate signed for it
+        key = self.run_action_plugin(
+            "network_automation_labs.devops.tls_private_key",
+            task_vars,
+            **{**module_args["key"], "deploy": False},
+        )
+        csr = self.run_action_plugin(
+            "network_automation_labs.devops.tls_csr",
+            task_vars,
+            private_key_content=key["private_key_content"],
+            options=module_args["csr"],
+        )
+        new_key = {}
+        if key["changed"]:
+            new_key = {
+                "private_key_path": module_args["key"]["path"],
+                "private_key_content": key["private_key_content"],
+            }
+        signed = self.run_action_plugin(
+            "network_automation_labs.devops.tls_certificate",
+            task_vars,
+            path=module_args["path"],
+            chain_path=module_args["chain_path"],
+            csr_content=csr["content"],
+            acme_directory=module_args["acme_directory"],
+            acme_account_email=module_args["acme_account_email"],
+            acme_account_key=module_args["acme_account_key"],
+            dns_provider=module_args["dns_provider"],
+            **new_key,
+        )
+        result["changed"] = key["changed"] or signed["changed"]
+        return result
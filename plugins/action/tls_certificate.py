@@ -1,3 +1,7 @@
+import os.path
+import tempfile
+
+from ansible import constants as C
 from ansible.errors import AnsibleActionFail
 from ansible.plugins.action import ActionBase
 from ansible.utils.display import Display
@@ -7,6 +11,8 @@ from ansible_collections.network_automation_labs.devops.plugins.module_utils.com
 )
 from ansible_collections.network_automation_labs.devops.plugins.module_utils.crypto import (
     CryptoPluginMixin,
+    expires_soon,
+    normalize_subject_alt_names,
 )
 
 display = Display()
@@ -19,14 +25,27 @@ class ActionModule(CryptoPluginMixin, ActionPluginMixin, ActionBase):
         _, module_args = self.validate_argument_spec(
             argument_spec={
                 "path": {"type": "str", "required": True},
+                "chain_path": {"type": "str", "required": False},
+                "private_key_path": {"type": "str", "required": False},
+                "private_key_content": {
+                    "type": "str",
+                    "required": False,
+                    "no_log": True,
+                },
                 "csr_path": {"type": "str", "required": False},
                 "csr_content": {"type": "str", "required": False},
+                "subject_alt_name": {
+                    "type": "list",
+                    "elements": "str",
+                    "required": False,
+                },
                 "acme_directory": {"type": "str", "required": True},
                 "acme_account_email": {"type": "str", "required": True},
                 "acme_account_key": {"type": "str", "required": True},
                 "dns_provider": {"type": "dict", "required": True},
             },
             required_one_of=[["csr_path", "csr_content"]],
+            required_together=[["private_key_path", "private_key_content"]],
         )
         num_providers = len(module_args["dns_provider"])
         if num_providers > 1:
@@ -49,102 +68,123 @@ class ActionModule(CryptoPluginMixin, ActionPluginMixin, ActionBase):
 
         dns_provider_options = module_args["dns_provider"][dns_provider]
 
-        # 1. Load existing certificate
-        certificate_content, loaded = self.load_file_if_exists(
-            task_vars, module_args["path"]
+        # 1. Get the existing certificate, its metadata is cached by checksum
+        certificate = self.certificate_metadata(task_vars, module_args["path"])
+        certificate_valid = certificate is not None and not expires_soon(
+            certificate["not_after"]
         )
-        certificate = None
-        if loaded and certificate_content is not None:
-            certificate = self.run_local_module(
-                "community.crypto.x509_certificate_info",
-                task_vars,
-                content=certificate_content,
-                valid_at={"month": "+30d"},
-            )
 
-        # 2. Load signing request
-        csr_content = self.load_or_content(
-            task_vars, module_args["csr_path"], module_args["csr_content"]
-        )
-        if csr_content is None:
+        # 2. Get the signing request
+        csr = None
+        csr_content = module_args["csr_content"]
+        if module_args["csr_path"] is not None:
+            csr = self.csr_metadata(task_vars, path=module_args["csr_path"])
+            if csr is not None:
+                # only loaded when the certificate has to be signed
+                csr_content = None
+        if csr is None and csr_content is not None:
+            csr = self.csr_metadata(task_vars, content=csr_content)
+
+        if csr is None and self._task.check_mode:
+            # the CSR would only be generated by an earlier task in a real run,
+            # so judge the existing certificate against the expected SANs if given
+            subject_alt_name = module_args["subject_alt_name"]
+            if not certificate_valid or (
+                subject_alt_name is not None
+                and normalize_subject_alt_names(subject_alt_name)
+                != normalize_subject_alt_names(certificate["subject_alt_name"])
+            ):
+                self.display_changed("Certificate needs to be re-signed.")
+                if self._task.diff:
+                    result["diff"] = self.certificate_diff(
+                        certificate, subject_alt_name or [], module_args["path"]
+                    )
+                result["changed"] = True
+            return result
+
+        if csr is None:
             result["failed"] = True
             result["msg"] = (
                 "Empty certificate sigining request. Provide valid csr_path or csr_content."
             )
             return result
 
-        csr = self.run_local_module(
-            "community.crypto.openssl_csr_info",
-            task_vars,
-            content=csr_content,
-        )
-
         # 3. Check if needs re-signing
-        if (
-            certificate is None
-            or not certificate["valid_at"]["month"]
-            or csr["subject_alt_name"] != certificate["subject_alt_name"]
-        ):
+        if not certificate_valid or normalize_subject_alt_names(
+            csr["subject_alt_name"]
+        ) != normalize_subject_alt_names(certificate["subject_alt_name"]):
             self.display_changed("Certificate needs to be re-signed.")
-            # 4. Generate challenge
-            dns_challenge = self.run_remote_module(
-                "community.crypto.acme_certificate",
-                task_vars,
-                acme_version=2,
-                terms_agreed=True,
-                acme_directory=module_args["acme_directory"],
-                challenge="dns-01",
-                account_email=module_args["acme_account_email"],
-                account_key_content=module_args["acme_account_key"],
-                csr_content=csr_content,
-                fullchain_dest=module_args["path"],
-                force=True,
-            )
+            if self._task.diff:
+                result["diff"] = self.certificate_diff(
+                    certificate, csr["subject_alt_name"], module_args["path"]
+                )
+            if self._task.check_mode:
+                result["changed"] = True
+                return result
 
-            # collect the TXT records
-            # TODO: what is "mode" used for?
-            txt_records = [
-                {"name": f"{name}.", "values": data, "mode": "subset"}
-                for name, data in dns_challenge["challenge_data_dns"].items()
-            ]
-            # 5. Set challenge TXT records
-            self.run_action_plugin(
-                f"network_automation_labs.devops.dns_provider_{dns_provider}",
-                task_vars,
-                state="present",
-                type="TXT",
-                records=txt_records,
-                **dns_provider_options,
-            )
+            if csr_content is None:
+                csr_content, _ = self.load_file_if_exists(
+                    task_vars, module_args["csr_path"]
+                )
 
-            # 6. Wait for DNS records to become available
-            self.run_local_module(
-                "community.dns.wait_for_txt",
-                task_vars,
-                records=txt_records,
-                # TODO: Remove this when my home dns is fixed
-                always_ask_default_resolver=False,
-                server=["1.1.1.1"],
-            )
-            display.warning(f"DNS CHALLENGE: {type(dns_challenge)}")
-            # 7. Perform challenge
-            self.run_remote_module(
-                "community.crypto.acme_certificate",
-                task_vars,
-                acme_version=2,
-                terms_agreed=True,
-                acme_directory=module_args["acme_directory"],
-                challenge="dns-01",
-                account_email=module_args["acme_account_email"],
-                account_key_content=module_args["acme_account_key"],
-                csr_content=csr_content,
-                fullchain_dest=module_args["path"],
-                data=dns_challenge,
-                force=True,
-            )
-            display.warning("Challenge completed")
-            # self.display_changed(f"Wrote certificate to {module_args['path']}")
-            result["changed"] = True
+            # 4. Generate challenge. acme_certificate runs on the controller so
+            # the signed certificate comes back to it and can be deployed with
+            # the key in one bundle. The module can only write the certificate
+            # to a file, so it goes to a temporary directory that only ever
+            # holds public material.
+            with tempfile.TemporaryDirectory(dir=C.DEFAULT_LOCAL_TMP) as workdir:
+                acme_args = {
+                    "acme_version": 2,
+                    "terms_agreed": True,
+                    "acme_directory": module_args["acme_directory"],
+                    "challenge": "dns-01",
+                    "account_email": module_args["acme_account_email"],
+                    "account_key_content": module_args["acme_account_key"],
+                    "csr_content": csr_content,
+                    "fullchain_dest": os.path.join(workdir, "fullchain.pem"),
+                    "chain_dest": os.path.join(workdir, "chain.pem"),
+                    "force": True,
+                }
+                dns_challenge = self.run_local_module(
+                    "community.crypto.acme_certificate", task_vars, **acme_args
+                )
+
+                # collect the TXT records
+                # TODO: what is "mode" used for?
+                txt_records = [
+                    {"name": f"{name}.", "values": data, "mode": "subset"}
+                    for name, data in dns_challenge["challenge_data_dns"].items()
+                ]
+                # 5. Set challenge TXT records
+                self.run_action_plugin(
+                    f"network_automation_labs.devops.dns_provider_{dns_provider}",
+                    task_vars,
+                    state="present",
+                    type="TXT",
+                    records=txt_records,
+                    **dns_provider_options,
+                )
+
+                # 6. Wait for DNS records to become available
+                self.run_local_module(
+                    "community.dns.wait_for_txt",
+                    task_vars,
+                    records=txt_records,
+                    # TODO: Remove this when my home dns is fixed
+                    always_ask_default_resolver=False,
+                    server=["1.1.1.1"],
+                )
+                # 7. Perform challenge
+                self.run_local_module(
+                    "community.crypto.acme_certificate",
+                    task_vars,
+                    data=dns_challenge,
+                    **acme_args,
+                )
+                with open(acme_args["fullchain_dest"], encoding="utf-8") as fh:
+                    fullchain = fh.read()
+                with open(acme_args["chain_dest"], encoding="utf-8") as fh:
+                    chain = fh.read()
 
             # 8. Cleanup
             self.run_action_plugin(
@@ -156,4 +196,29 @@ class ActionModule(CryptoPluginMixin, ActionPluginMixin, ActionBase):
                 **dns_provider_options,
             )
 
+            # 9. Deploy the certificate, chain and key together
+            files = [
+                {"dest": module_args["path"], "content": fullchain, "mode": "0644"}
+            ]
+            if module_args["chain_path"]:
+                files.append(
+                    {
+                        "dest": module_args["chain_path"],
+                        "content": chain,
+                        "mode": "0644",
+                    }
+                )
+            if module_args["private_key_path"]:
+                files.append(
+                    {
+                        "dest": module_args["private_key_path"],
+                        "content": module_args["private_key_content"],
+                        "mode": "0600",
+                    }
+                )
+            # the certificate was just signed, so there is nothing to compare against
+            self.transfer_files(task_vars, files, compare_first=False)
+            self.display_changed(f"Wrote certificate to {module_args['path']}")
+            result["changed"] = True
+
         return result
@@ -5,6 +5,7 @@ from ansible_collections.network_automation_labs.devops.plugins.module_utils.com
 )
 from ansible_collections.network_automation_labs.devops.plugins.module_utils.crypto import (
     CryptoPluginMixin,
+    expected_subject_alt_names,
 )
 
 display = Display()
@@ -25,15 +26,20 @@ class ActionModule(CryptoPluginMixin, ActionPluginMixin, ActionBase):
                 "options": {"type": "dict", "required": False, "default": {}},
             },
         )
-        with self.tempfile(task_vars) as filename:
-            csr_results = self.run_local_module(
-                "community.crypto.openssl_csr",
-                task_vars,
-                path=filename,
-                privatekey_content=module_args["private_key_content"],
-                return_content=True,
-                **module_args["options"],
-            )
-            results["content"] = csr_results["csr"]
+        results["subject_alt_name"] = sorted(
+            expected_subject_alt_names(module_args["options"])
+        )
+        if self._task.check_mode:
+            # CSRs are not persisted, generating one in check mode only costs time
+            results["content"] = None
+            return results
+
+        csr_results = self.run_local_module(
+            "community.crypto.openssl_csr_pipe",
+            task_vars,
+            privatekey_content=module_args["private_key_content"],
+            **module_args["options"],
+        )
+        results["content"] = csr_results["csr"]
 
         return results
@@ -15,19 +15,21 @@ display = Display()
 
 class ActionModule(CryptoPluginMixin, ActionPluginMixin, ActionBase):
     def generate_new_key(self, task_vars, module_args):
-        content = ""
-        with self.tempfile(task_vars, module_args["path"]) as filename:
-            result = self.run_local_module(
-                "community.crypto.openssl_privatekey",
+        result = self.run_local_module(
+            "community.crypto.openssl_privatekey_pipe",
+            task_vars,
+            size=module_args["size"],
+            type=module_args["type"],
+            curve=module_args["curve"],
+        )
+        content = result["privatekey"]
+        if module_args["deploy"]:
+            # the key was just generated, so there is nothing to compare against
+            self.transfer_files(
                 task_vars,
-                path=filename,
-                size=module_args["size"],
-                type=module_args["type"],
-                curve=module_args["curve"],
-                return_content=True,
+                [{"dest": module_args["path"], "content": content}],
+                compare_first=False,
             )
-            content = result["privatekey"]
-
         return content
 
     def run(self, tmp=None, task_vars=None):
@@ -43,8 +45,25 @@ class ActionModule(CryptoPluginMixin, ActionPluginMixin, ActionBase):
                 "size": {"type": "int", "required": True},
                 "type": {"type": "str", "required": True},
                 "curve": {"type": "str", "required": True},
+                "deploy": {"type": "bool", "required": False, "default": True},
             },
         )
+        if self._task.check_mode:
+            # key material is never read in check mode, knowing it exists is enough
+            stat = self.run_remote_module(
+                "ansible.builtin.stat",
+                task_vars,
+                path=module_args["path"],
+                get_checksum=False,
+            )
+            if not stat["stat"]["exists"]:
+                self.display_changed(
+                    f"Would generate private key {module_args['path']}"
+                )
+            result["changed"] = not stat["stat"]["exists"]
+            result["private_key_content"] = None
+            return result
+
         content, loaded = self.load_or_run(
             task_vars, module_args, module_args["path"], self.generate_new_key
         )
@@ -10,7 +10,6 @@ except AttributeError:
     AnsibleTypeError = ansible.errors.AnsibleFilterTypeError
 
 from ansible.utils.display import Display
-from netaddr import AddrFormatError, IPAddress
 
 display = Display()
 
@@ -153,6 +152,10 @@ def broadcast_addresses(hostvars):
             constructed from the `hostvars['ansible_interfaces']` list of interface names.
 
     """
+    # netaddr is only needed here, so defer the import until the filter is
+    # used rather than paying for it whenever the filter plugin is loaded
+    from netaddr import AddrFormatError, IPAddress
+
     addresses = {}
 
     for interface in interfaces(hostvars, filter_names=["lo"]):
@@ -1,5 +1,6 @@
 """Various utility filters."""
 
+import ipaddress
 from collections.abc import Mapping
 
 import ansible.errors
@@ -80,6 +81,42 @@ def set_uid_gid(config_dict, ansible_facts, username):
     }
 
 
+def hosts_index(hostvars, hosts=None):
+    """Build a sorted address to host names index for /etc/hosts.
+
+    The index is built in a single pass over the given hosts using their
+    cached `default_ipv4` and `default_ipv6` facts, so it should be computed
+    once per play (e.g. with `run_once`) and shared with every host rather
+    than recomputed in each host's template. Hosts without facts are skipped.
+
+    Args:
+        hostvars (dict): The `hostvars` mapping.
+        hosts (list[str]): The hosts to include, defaults to every host in `hostvars`.
+
+    Returns:
+        list[tuple[str, list[str]]]: (address, names) pairs sorted by address.
+
+    """
+    index = {}
+    for host in hostvars if hosts is None else hosts:
+        host_vars = hostvars[host]
+        facts = host_vars.get("ansible_facts", {})
+        names = [host_vars.get("inventory_hostname_short", host.split(".")[0]), host]
+        for fact in ("default_ipv4", "default_ipv6"):
+            address = facts.get(fact, {}).get("address")
+            if not address:
+                continue
+            address_names = index.setdefault(ipaddress.ip_address(address), [])
+            address_names.extend(name for name in names if name not in address_names)
+
+    return [
+        (str(address), names)
+        for address, names in sorted(
+            index.items(), key=lambda item: (item[0].version, item[0])
+        )
+    ]
+
+
 class FilterModule:
     """Utility filters."""
 
@@ -88,6 +125,7 @@ class FilterModule:
         return {
             "deb_architecture": deb_architecture,
             "dict2tuple": dict2tuple,
+            "hosts_index": hosts_index,
             "next_subids": next_subids,
             "set_uid_gid": set_uid_gid,
         }
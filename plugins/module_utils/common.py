@@ -1,29 +1,36 @@
 import base64
+import hashlib
 import os
-from contextlib import contextmanager
-from functools import wraps
+from functools import cache, wraps
 from os import path
-from tempfile import mkstemp
 from typing import Any
 
 from ansible import constants as C
 from ansible.errors import AnsibleError
 from ansible.plugins.loader import connection_loader
 from ansible.utils.display import Display
+from ansible.vars.clean import remove_internal_keys
 
 from .types import ActionBaseProtocol
 
 display = Display()
 
 
-def list_action_plugins(filter_predicate=None):
+@cache
+def _action_plugin_names() -> tuple[str, ...]:
     filenames = os.listdir(path.join(path.dirname(__file__), "..", "action"))
-    filenames = filter(lambda filename: filename.endswith(".py"), filenames)
-    action_plugins = [filename.removesuffix(".py") for filename in filenames]
+    return tuple(
+        filename.removesuffix(".py")
+        for filename in sorted(filenames)
+        if filename.endswith(".py")
+    )
+
 
+def list_action_plugins(filter_predicate=None):
+    action_plugins = _action_plugin_names()
     if filter_predicate:
-        action_plugins = filter(filter_predicate, action_plugins)
-    return action_plugins
+        return [plugin for plugin in action_plugins if filter_predicate(plugin)]
+    return list(action_plugins)
 
 
 class RunFailedError(AnsibleError):
@@ -57,24 +64,53 @@ class ActionPluginMixin(ActionBaseProtocol):
     def display_ok(self, msg):
         display.display(f"[{self.host_label}] {msg}", C.COLOR_UNCHANGED)  # type: ignore
 
-    @contextmanager
-    def tempfile(self, task_vars, dest=None, dest_mode="600"):
-        filepath = ""
-        try:
-            fd, filepath = mkstemp()
-            os.close(fd)
-            yield filepath
-            if dest is not None:
-                self.run_action_plugin(
-                    "ansible.builtin.copy",
-                    task_vars,
-                    src=filepath,
-                    dest=dest,
-                    mode=dest_mode,
-                )
-        finally:
-            if filepath:
-                os.remove(filepath)
+    def transfer_files(self, task_vars, files: list[dict], compare_first=True) -> dict:
+        """Deploy in-memory content to the remote host as a single bundle.
+
+        Each entry in `files` has a `dest` and `content` (str or bytes) and
+        optionally `mode`, `owner` and `group`. Remote checksums are compared
+        before any content is sent, and only the files that differ are
+        transferred. Those are staged and then moved into place together.
+
+        Set `compare_first` to False when the content is known to be new (for
+        instance a freshly generated key), to send it in the first round trip.
+        """
+        bundle = []
+        contents = {}
+        for file in files:
+            content = file["content"]
+            if isinstance(content, str):
+                content = content.encode("utf-8")
+            contents[file["dest"]] = base64.b64encode(content).decode()
+            bundle.append(
+                {
+                    "path": file["dest"],
+                    "checksum": hashlib.sha1(content).hexdigest(),
+                    "mode": file.get("mode", "0600"),
+                    "owner": file.get("owner"),
+                    "group": file.get("group"),
+                }
+            )
+
+        if compare_first:
+            result = self.run_remote_module(
+                "network_automation_labs.devops.file_bundle",
+                task_vars,
+                files=bundle,
+            )
+            stale = set(result["stale"])
+            if not stale or self._task.check_mode:
+                return result
+            bundle = [file for file in bundle if file["path"] in stale]
+
+        result = self.run_remote_module(
+            "network_automation_labs.devops.file_bundle",
+            task_vars,
+            files=[{**file, "content": contents[file["path"]]} for file in bundle],
+        )
+        if compare_first:
+            result["changed"] = True
+        return result
 
     @raise_on_failure
     def run_local_module(self, module_name: str, task_vars, **module_args) -> dict:
@@ -104,13 +140,10 @@ class ActionPluginMixin(ActionBaseProtocol):
         self._connection = old_connection
         return result
 
-    @raise_on_failure
-    def run_remote_module(self, module_name: str, task_vars, **module_args) -> dict:
-        response = self._execute_module(  # type: ignore
-            module_name,
-            module_args=module_args,
-            task_vars=task_vars,
-        )
+    def display_module_messages(self, response: dict):
+        for warning in response.pop("warnings", None) or []:
+            display.warning(getattr(getattr(warning, "event", None), "msg", warning))
+
         deprecations = response.pop("deprecations", None)
         if deprecations:
             for deprecation in deprecations:
@@ -119,8 +152,87 @@ class ActionPluginMixin(ActionBaseProtocol):
                     version=deprecation.version,
                     deprecator=deprecation.deprecator,
                 )
+
+    @raise_on_failure
+    def run_remote_module(self, module_name: str, task_vars, **module_args) -> dict:
+        response = self._execute_module(  # type: ignore
+            module_name,
+            module_args=module_args,
+            task_vars=task_vars,
+        )
+        self.display_module_messages(response)
         return response
 
+    def _build_module(self, module_name: str, module_args: dict, task_vars):
+        """Build a module payload, returning its style, data and serialization profile."""
+        configured = self._configure_module(module_name, module_args, task_vars)  # type: ignore
+        if len(configured) == 2:
+            # ansible-core >= 2.19 returns (_BuiltModule, module_path)
+            module_bits, _ = configured
+            return (
+                module_bits.module_style,
+                module_bits.b_module_data,
+                module_bits.serialization_profile,
+            )
+
+        module_style, _, module_data, _ = configured
+        if isinstance(module_data, str):
+            module_data = module_data.encode("utf-8")
+        return module_style, module_data, None
+
+    def _parse_batched_result(self, raw_result: dict, profile) -> dict:
+        if raw_result.get("skipped"):
+            return raw_result
+
+        if profile is None:
+            result = self._parse_returned_data(raw_result)  # type: ignore
+        else:
+            result = self._parse_returned_data(raw_result, profile)  # type: ignore
+        remove_internal_keys(result)
+        self.display_module_messages(result)
+        return result
+
+    def run_remote_modules(
+        self, task_vars, invocations: list[tuple[str, dict]], stop_on_failure=True
+    ) -> list[dict]:
+        """Run several modules on the remote host in a single round trip.
+
+        The modules are built on the controller and sent to the host as one
+        `module_batch` payload, which runs them in order. When
+        `stop_on_failure` is set, the invocations after a failed one are
+        skipped. Failures are not raised, each invocation's result is returned.
+        """
+        payloads = []
+        profiles = []
+        for module_name, invocation_args in invocations:
+            module_args = dict(invocation_args)
+            self._update_module_args(module_name, module_args, task_vars)  # type: ignore
+            module_style, module_data, profile = self._build_module(
+                module_name, module_args, task_vars
+            )
+            if module_style != "new":
+                raise AnsibleError(
+                    f"{module_name} can not be batched, only AnsiballZ modules are supported"
+                )
+            payloads.append(
+                {
+                    "name": module_name,
+                    "data": base64.b64encode(module_data).decode(),
+                }
+            )
+            profiles.append(profile)
+
+        response = self.run_remote_module(
+            "network_automation_labs.devops.module_batch",
+            task_vars,
+            payloads=payloads,
+            stop_on_failure=stop_on_failure,
+        )
+        return [
+            self._parse_batched_result(raw_result, profile)
+            for raw_result, profile in zip(response["results"], profiles, strict=True)
+        ]
+
     @raise_on_failure
     def run_action_plugin(self, plugin_name, task_vars, **module_args) -> dict:
         new_task = self._task.copy()
@@ -140,19 +252,22 @@ class ActionPluginMixin(ActionBaseProtocol):
         self, task_vars, remote_file_path, default_content=None
     ) -> tuple[str | None, bool]:
         content = default_content
-        result = self.run_remote_module(
-            "ansible.builtin.stat",
+        stat, slurp = self.run_remote_modules(
             task_vars,
-            path=remote_file_path,
+            [
+                ("ansible.builtin.stat", {"path": remote_file_path}),
+                ("ansible.builtin.slurp", {"src": remote_file_path}),
+            ],
+            stop_on_failure=False,
         )
+        if "failed" in stat:
+            raise RunFailedError(stat.get("msg", "Error occurred"), stat)
+
         loaded = False
-        if result["stat"]["exists"]:
-            result = self.run_remote_module(
-                "ansible.builtin.slurp",
-                task_vars,
-                src=remote_file_path,
-            )
-            content = base64.b64decode(result["content"]).decode("utf-8")
+        if stat["stat"]["exists"]:
+            if "failed" in slurp:
+                raise RunFailedError(slurp.get("msg", "Error occurred"), slurp)
+            content = base64.b64decode(slurp["content"]).decode("utf-8")
             loaded = True
         return content, loaded
 
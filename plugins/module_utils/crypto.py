@@ -1,6 +1,111 @@
+import base64
+import hashlib
+import json
+import os
+import tempfile
+from datetime import datetime, timedelta, timezone
 from typing import Any
+
+from ansible import constants as C
+
 from .types import ActionBaseProtocol
 
+# Parsed certificate and CSR metadata, keyed by the SHA1 checksum of the file.
+# Only public information is stored, so it is safe to keep across runs.
+METADATA_CACHE_DIR = os.path.join(
+    C.ANSIBLE_HOME, "cache", "network_automation_labs.devops", "crypto"
+)
+
+# Certificates are renewed when they expire within this period
+RENEWAL_PERIOD = timedelta(days=30)
+
+
+def normalize_subject_alt_names(subject_alt_names):
+    """Normalize SANs for comparison, ACME issuers lower-case DNS names."""
+    normalized = set()
+    for san in subject_alt_names or []:
+        kind, _, value = san.partition(":")
+        if kind.strip().upper() == "DNS":
+            normalized.add(f"DNS:{value.strip().lower()}")
+        else:
+            normalized.add(san)
+    return normalized
+
+
+def _option(options, *names):
+    """Get the first of `names` (an option and its aliases) set in `options`."""
+    for name in names:
+        if options.get(name) is not None:
+            return options[name]
+    return None
+
+
+def _subject_common_name(subject):
+    """Get the common name from an `openssl_csr` `subject` dict or list of dicts."""
+    entries = subject if isinstance(subject, list) else [subject or {}]
+    for entry in entries:
+        for key, value in entry.items():
+            if key in ("CN", "commonName") and value:
+                return value
+    return None
+
+
+def expected_subject_alt_names(csr_options):
+    """Get the normalized SANs a CSR generated from `csr_options` would request.
+
+    Mirrors `community.crypto.openssl_csr`, including its option aliases. When
+    no SANs are given and `use_common_name_for_san` is enabled, the common name
+    from `common_name` or else from the `subject` dict is the only SAN.
+    """
+    subject_alt_name = _option(csr_options, "subject_alt_name", "subjectAltName")
+    if isinstance(subject_alt_name, str):
+        subject_alt_name = subject_alt_name.split(",")
+    if subject_alt_name:
+        return normalize_subject_alt_names(subject_alt_name)
+
+    use_common_name = _option(
+        csr_options, "use_common_name_for_san", "useCommonNameForSAN"
+    )
+    if use_common_name is False:
+        return set()
+
+    common_name = _option(
+        csr_options, "common_name", "CN", "commonName"
+    ) or _subject_common_name(csr_options.get("subject"))
+    if common_name:
+        return normalize_subject_alt_names([f"DNS:{common_name}"])
+    return set()
+
+
+def expires_soon(not_after, now=None):
+    """Check if an ASN.1 `not_after` time is within the renewal period."""
+    expires = datetime.strptime(not_after, "%Y%m%d%H%M%SZ").replace(tzinfo=timezone.utc)
+    return expires <= (now or datetime.now(timezone.utc)) + RENEWAL_PERIOD
+
+
+def load_cached_metadata(kind, checksum):
+    """Get the cached metadata of a `kind` of file, or None if not cached."""
+    path = os.path.join(METADATA_CACHE_DIR, kind, f"{checksum}.json")
+    try:
+        with open(path, encoding="utf-8") as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return None
+
+
+def store_cached_metadata(kind, checksum, metadata):
+    """Cache the metadata of a `kind` of file, the cache is best effort."""
+    directory = os.path.join(METADATA_CACHE_DIR, kind)
+    try:
+        os.makedirs(directory, exist_ok=True)
+        fd, staged_path = tempfile.mkstemp(dir=directory, prefix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            json.dump(metadata, fh)
+        os.replace(staged_path, os.path.join(directory, f"{checksum}.json"))
+    except OSError:
+        pass
+
+
 class CryptoPluginMixin(ActionBaseProtocol):
     _task_vars: dict
 
@@ -14,3 +119,75 @@ class CryptoPluginMixin(ActionBaseProtocol):
             else:
                 self._tls_vars = {}
         return self._tls_vars
+
+    def certificate_diff(self, certificate, subject_alt_name, path) -> dict[str, str]:
+        before = ""
+        if certificate is not None:
+            before = (
+                f"subject_alt_name: {sorted(certificate['subject_alt_name'] or [])}\n"
+                f"not_after: {certificate['not_after']}\n"
+            )
+        after = f"subject_alt_name: {sorted(subject_alt_name)}\nnot_after: (renewed)\n"
+        return {
+            "before_header": path,
+            "after_header": path,
+            "before": before,
+            "after": after,
+        }
+
+    def _metadata(self, task_vars, module_name, checksum, load_content):
+        """Get the `not_after` and `subject_alt_name` parsed by `module_name`.
+
+        The crypto module only runs on the controller when nothing is cached
+        for `checksum`, `load_content` gets the content to parse in that case.
+        """
+        kind = module_name.rpartition(".")[2]
+        metadata = load_cached_metadata(kind, checksum)
+        if metadata is None:
+            info = self.run_local_module(  # type: ignore
+                module_name, task_vars, content=load_content()
+            )
+            metadata = {
+                "not_after": info.get("not_after"),
+                "subject_alt_name": info["subject_alt_name"] or [],
+            }
+            store_cached_metadata(kind, checksum, metadata)
+        return metadata
+
+    def _remote_metadata(self, task_vars, module_name, path):
+        """Get the metadata of the remote file at `path`, or None if absent.
+
+        Only the checksum of the file is fetched unless its metadata is not
+        cached yet.
+        """
+        stat = self.run_remote_module(  # type: ignore
+            "ansible.builtin.stat",
+            task_vars,
+            path=path,
+            get_checksum=True,
+            checksum_algorithm="sha1",
+        )["stat"]
+        if not stat["exists"]:
+            return None
+
+        def load_content():
+            slurp = self.run_remote_module(  # type: ignore
+                "ansible.builtin.slurp", task_vars, src=path
+            )
+            return base64.b64decode(slurp["content"]).decode("utf-8")
+
+        return self._metadata(task_vars, module_name, stat["checksum"], load_content)
+
+    def certificate_metadata(self, task_vars, path) -> dict[str, Any] | None:
+        """Get the metadata of the remote certificate at `path`."""
+        return self._remote_metadata(
+            task_vars, "community.crypto.x509_certificate_info", path
+        )
+
+    def csr_metadata(self, task_vars, path=None, content=None) -> dict[str, Any] | None:
+        """Get the metadata of the remote CSR at `path` or of the CSR `content`."""
+        module_name = "community.crypto.openssl_csr_info"
+        if path is not None:
+            return self._remote_metadata(task_vars, module_name, path)
+        checksum = hashlib.sha1(content.encode("utf-8")).hexdigest()
+        return self._metadata(task_vars, module_name, checksum, lambda: content)
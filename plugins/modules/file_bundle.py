@@ -0,0 +1,149 @@
+"""Module for atomically deploying a bundle of files."""
+
+DOCUMENTATION = r"""
+---
+module: file_bundle
+short_description: Atomically deploy a bundle of files from in-memory content
+description:
+  - Compares the checksum of each remote file with the expected checksum before
+    any content is sent.
+  - Files whose content matches only have their ownership and permissions updated.
+  - Files that differ and were sent with O(files[].content) are staged next to their
+    destination and are only moved into place once every file in the bundle has been
+    staged successfully. If staging fails, no file is replaced and every staged file
+    is removed.
+  - Each file is moved into place atomically, but the moves are not transactional
+    across the bundle. If a move fails, the files moved before it stay replaced.
+  - Files that differ and were sent without content are reported in RV(stale) so the
+    caller can send only those.
+options:
+  files:
+    description: The files in the bundle.
+    type: list
+    elements: dict
+    required: true
+    suboptions:
+      path:
+        description: Absolute path of the file on the target.
+        type: path
+        required: true
+      checksum:
+        description: SHA1 checksum of the expected file content.
+        type: str
+        required: true
+      content:
+        description: Base64 encoded file content.
+        type: str
+      mode:
+        description: Permissions of the file.
+        type: raw
+        default: "0600"
+      owner:
+        description: Owner of the file.
+        type: str
+      group:
+        description: Group of the file.
+        type: str
+"""
+
+EXAMPLES = r"""
+- name: Check which files are out of date
+  network_automation_labs.devops.file_bundle:
+    files:
+      - path: /etc/ssl/private/host.pem
+        checksum: "{{ key_content | ansible.builtin.hash('sha1') }}"
+"""
+
+RETURN = r"""
+stale:
+  description: Paths whose content differs and for which no content was given.
+  returned: always
+  type: list
+  elements: str
+updated:
+  description: Paths whose content was replaced.
+  returned: always
+  type: list
+  elements: str
+"""
+
+import base64
+import os
+import tempfile
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible.module_utils.common.text.converters import to_native
+
+
+def stage_file(module, file):
+    """Write the content of `file` to a temporary file next to its destination.
+
+    The staged file is registered for cleanup, so it is removed when the module
+    exits unless it has been moved into place.
+    """
+    fd, staged_path = tempfile.mkstemp(
+        dir=os.path.dirname(file["path"]), prefix=".ansible_tmp"
+    )
+    module.add_cleanup_file(staged_path)
+    with os.fdopen(fd, "wb") as fh:
+        fh.write(base64.b64decode(file["content"]))
+
+    checksum = module.sha1(staged_path)
+    if checksum != file["checksum"]:
+        raise ValueError(f"expected checksum {file['checksum']}, got {checksum}")
+    return staged_path
+
+
+def main():
+    """Run the module."""
+    module = AnsibleModule(
+        argument_spec={
+            "files": {
+                "type": "list",
+                "elements": "dict",
+                "required": True,
+                "options": {
+                    "path": {"type": "path", "required": True},
+                    "checksum": {"type": "str", "required": True},
+                    "content": {"type": "str", "no_log": True},
+                    "mode": {"type": "raw", "default": "0600"},
+                    "owner": {"type": "str"},
+                    "group": {"type": "str"},
+                },
+            },
+        },
+        supports_check_mode=True,
+    )
+
+    changed = False
+    stale = []
+    staged = []
+    for file in module.params["files"]:
+        if (
+            os.path.exists(file["path"])
+            and module.sha1(file["path"]) == file["checksum"]
+        ):
+            file_args = module.load_file_common_arguments(file)
+            changed = module.set_fs_attributes_if_different(file_args, changed)
+        elif file["content"] is None or module.check_mode:
+            stale.append(file["path"])
+        else:
+            try:
+                staged.append((stage_file(module, file), file))
+            except (OSError, ValueError) as ex:
+                # fail_json removes every file registered by stage_file
+                module.fail_json(msg=f"Failed to stage {file['path']}: {to_native(ex)}")
+
+    updated = []
+    for staged_path, file in staged:
+        module.atomic_move(staged_path, file["path"])
+        file_args = module.load_file_common_arguments(file)
+        module.set_fs_attributes_if_different(file_args, True)
+        updated.append(file["path"])
+
+    changed = changed or bool(updated) or (module.check_mode and bool(stale))
+    module.exit_json(changed=changed, stale=stale, updated=updated)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Module for running a batch of prepared module payloads."""
+
+DOCUMENTATION = r"""
+---
+module: module_batch
+short_description: Run several modules on the target in a single round trip
+description:
+  - Runs a list of module payloads, in order, on the target host and returns the
+    result of each one.
+  - The payloads are built on the controller by
+    C(ActionPluginMixin.run_remote_modules), this module is not meant to be used
+    directly from a task.
+options:
+  payloads:
+    description: The module payloads to run.
+    type: list
+    elements: dict
+    required: true
+    suboptions:
+      name:
+        description: Name of the module, used for reporting.
+        type: str
+        required: true
+      data:
+        description: Base64 encoded AnsiballZ payload of the module.
+        type: str
+        required: true
+  stop_on_failure:
+    description: Skip the remaining payloads once one of them fails.
+    type: bool
+    default: true
+"""
+
+RETURN = r"""
+results:
+  description:
+    - The raw C(rc), C(stdout) and C(stderr) of each payload, in order.
+    - Payloads skipped after a failure have C(skipped) set instead.
+  returned: always
+  type: list
+  elements: dict
+"""
+
+import base64
+import json
+import os
+import sys
+import tempfile
+
+from ansible.module_utils.basic import AnsibleModule
+
+
+def has_failed(rc, stdout):
+    """Check if a module failed from its return code and JSON result."""
+    if rc != 0:
+        return True
+    start = stdout.find("{")
+    try:
+        result = json.loads(stdout[start:]) if start >= 0 else None
+    except ValueError:
+        return True
+    return not isinstance(result, dict) or bool(result.get("failed"))
+
+
+def run_payload(module, payload):
+    """Write a payload to a temporary file and execute it.
+
+    The raw output is returned so the controller can parse it the same way
+    it parses the output of a module it ran directly.
+    """
+    fd, path = tempfile.mkstemp(dir=module.tmpdir, suffix=".py")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(base64.b64decode(payload["data"]))
+        rc, stdout, stderr = module.run_command([sys.executable, path])
+    finally:
+        os.remove(path)
+
+    return {"rc": rc, "stdout": stdout, "stderr": stderr}
+
+
+def main():
+    """Run the module."""
+    module = AnsibleModule(
+        argument_spec={
+            "payloads": {
+                "type": "list",
+                "elements": "dict",
+                "required": True,
+                "options": {
+                    "name": {"type": "str", "required": True},
+                    "data": {"type": "str", "required": True, "no_log": True},
+                },
+            },
+            "stop_on_failure": {"type": "bool", "default": True},
+        },
+        supports_check_mode=True,
+    )
+
+    results = []
+    failed = False
+    for payload in module.params["payloads"]:
+        if failed and module.params["stop_on_failure"]:
+            results.append({"skipped": True, "msg": "Skipped after a previous failure"})
+            continue
+        result = run_payload(module, payload)
+        failed = failed or has_failed(result["rc"], result["stdout"])
+        results.append(result)
+
+    module.exit_json(results=results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+"""Tests for the network_automation_labs.devops collection."""
@@ -0,0 +1,131 @@
+"""Shared pytest fixtures."""
+
+import importlib
+import json
+import os
+import pathlib
+import subprocess
+import sys
+import textwrap
+
+import pytest
+
+COLLECTION_ROOT = pathlib.Path(__file__).resolve().parents[1]
+
+
+@pytest.fixture(scope="session")
+def collections_path(tmp_path_factory):
+    """Get a collections path from which this collection can be imported."""
+    root = tmp_path_factory.mktemp("collections")
+    namespace = root / "ansible_collections" / "network_automation_labs"
+    namespace.mkdir(parents=True)
+    (namespace / "devops").symlink_to(COLLECTION_ROOT)
+    return root
+
+
+@pytest.fixture(scope="session")
+def collection(collections_path):
+    """Get a function that imports a module from this collection in-process."""
+    sys.path.insert(0, str(collections_path))
+
+    def import_module(name):
+        return importlib.import_module(
+            f"ansible_collections.network_automation_labs.devops.plugins.{name}"
+        )
+
+    yield import_module
+    sys.path.remove(str(collections_path))
+
+
+ACTION_PLUGIN = """
+from ansible.plugins.action import ActionBase
+from ansible_collections.network_automation_labs.devops.plugins.module_utils.common import (
+    ActionPluginMixin,
+)
+
+
+class ActionModule(ActionPluginMixin, ActionBase):
+    def run(self, tmp=None, task_vars=None):
+        result = super().run(tmp, task_vars)
+        args = self._task.args
+        if "load" in args:
+            content, loaded = self.load_file_if_exists(task_vars, args["load"])
+            result["content"] = content
+            result["loaded"] = loaded
+        elif "transfer" in args:
+            result.update(
+                self.transfer_files(
+                    task_vars,
+                    args["transfer"],
+                    compare_first=args.get("compare_first", True),
+                )
+            )
+        else:
+            result["results"] = self.run_remote_modules(
+                task_vars,
+                [tuple(invocation) for invocation in args["invocations"]],
+                stop_on_failure=args.get("stop_on_failure", True),
+            )
+        return result
+"""
+
+PLAYBOOK = """
+- hosts: localhost
+  gather_facts: false
+  tasks:
+    - mixin_harness: {args}
+      register: action
+
+    - ansible.builtin.copy:
+        content: "{{{{ action | to_json }}}}"
+        dest: "{output}"
+      check_mode: false
+"""
+
+
+@pytest.fixture
+def run_action(tmp_path, collections_path):
+    """Get a function running `ActionPluginMixin` methods on localhost.
+
+    The action is run by ansible-playbook with the local connection plugin,
+    through a small action plugin that picks the method from its arguments.
+    """
+    (tmp_path / "action_plugins").mkdir()
+    (tmp_path / "action_plugins" / "mixin_harness.py").write_text(ACTION_PLUGIN)
+
+    def run(check=False, **args):
+        output = tmp_path / "output.json"
+        playbook = tmp_path / "playbook.yml"
+        playbook.write_text(
+            textwrap.dedent(PLAYBOOK).format(args=json.dumps(args), output=output)
+        )
+        env = {
+            **os.environ,
+            "ANSIBLE_COLLECTIONS_PATH": str(collections_path),
+            "ANSIBLE_LOCAL_TEMP": str(tmp_path / "local_tmp"),
+            "ANSIBLE_REMOTE_TEMP": str(tmp_path / "remote_tmp"),
+        }
+        subprocess.run(
+            [
+                sys.executable,
+                "-m",
+                "ansible",
+                "playbook",
+                "-i",
+                "localhost,",
+                "-c",
+                "local",
+                "-e",
+                f"ansible_python_interpreter={sys.executable}",
+                *(["--check"] if check else []),
+                str(playbook),
+            ],
+            cwd=tmp_path,
+            env=env,
+            capture_output=True,
+            check=True,
+            text=True,
+        )
+        return json.loads(output.read_text())
+
+    return run
@@ -0,0 +1,106 @@
+"""Tests for the crypto module utils."""
+
+from datetime import datetime, timezone
+
+import pytest
+
+
+@pytest.fixture
+def crypto(collection):
+    """Get the crypto module utils."""
+    return collection("module_utils.crypto")
+
+
+@pytest.mark.parametrize(
+    ("options", "expected"),
+    [
+        ({"subject_alt_name": ["DNS:Host.Example.com"]}, {"DNS:host.example.com"}),
+        (
+            {"subjectAltName": ["DNS:host.example.com", "IP:192.0.2.1"]},
+            {"DNS:host.example.com", "IP:192.0.2.1"},
+        ),
+        ({"common_name": "host.example.com"}, {"DNS:host.example.com"}),
+        ({"CN": "host.example.com"}, {"DNS:host.example.com"}),
+        ({"commonName": "host.example.com"}, {"DNS:host.example.com"}),
+        ({"subject": {"CN": "Host.example.com"}}, {"DNS:host.example.com"}),
+        (
+            {"subject": [{"O": "Example"}, {"commonName": "host.example.com"}]},
+            {"DNS:host.example.com"},
+        ),
+        (
+            {"common_name": "a.example.com", "subject": {"CN": "b.example.com"}},
+            {"DNS:a.example.com"},
+        ),
+        ({"CN": "host.example.com", "useCommonNameForSAN": False}, set()),
+        ({}, set()),
+    ],
+)
+def test_expected_subject_alt_names(crypto, options, expected):
+    """Test that the SANs are derived the same way openssl_csr does."""
+    assert crypto.expected_subject_alt_names(options) == expected
+
+
+def test_normalize_subject_alt_names(crypto):
+    """Test that only DNS names are lower-cased."""
+    assert crypto.normalize_subject_alt_names(
+        ["dns:Host.Example.com", "email:Admin@Example.com"]
+    ) == {"DNS:host.example.com", "email:Admin@Example.com"}
+
+
+@pytest.mark.parametrize(
+    ("not_after", "expected"),
+    [
+        ("20260101000000Z", True),
+        ("20260131000000Z", True),
+        ("20260131000001Z", False),
+        ("20270101000000Z", False),
+    ],
+)
+def test_expires_soon(crypto, not_after, expected):
+    """Test that certificates expiring within 30 days are renewed."""
+    now = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    assert crypto.expires_soon(not_after, now) is expected
+
+
+@pytest.fixture
+def cache_dir(crypto, tmp_path, monkeypatch):
+    """Get an empty metadata cache directory."""
+    monkeypatch.setattr(crypto, "METADATA_CACHE_DIR", str(tmp_path / "cache"))
+    return tmp_path / "cache"
+
+
+def test_metadata_cache(crypto, cache_dir):
+    """Test that metadata is cached per kind and checksum."""
+    metadata = {"not_after": "20260101000000Z", "subject_alt_name": ["DNS:a"]}
+
+    assert crypto.load_cached_metadata("x509_certificate_info", "abc") is None
+    crypto.store_cached_metadata("x509_certificate_info", "abc", metadata)
+
+    assert crypto.load_cached_metadata("x509_certificate_info", "abc") == metadata
+    assert crypto.load_cached_metadata("openssl_csr_info", "abc") is None
+    assert not list(cache_dir.rglob(".tmp*"))
+
+
+def test_metadata_cache_corrupt(crypto, cache_dir):
+    """Test that an unreadable cache entry is a cache miss."""
+    (cache_dir / "openssl_csr_info").mkdir(parents=True)
+    (cache_dir / "openssl_csr_info" / "abc.json").write_text("{")
+
+    assert crypto.load_cached_metadata("openssl_csr_info", "abc") is None
+
+
+def test_csr_metadata_runs_module_on_miss(crypto, cache_dir):
+    """Test that the crypto module only runs when nothing is cached."""
+    calls = []
+
+    class Plugin(crypto.CryptoPluginMixin):
+        def run_local_module(self, module_name, task_vars, **module_args):
+            calls.append((module_name, module_args))
+            return {"subject_alt_name": ["DNS:host.example.com"]}
+
+    plugin = Plugin()
+    for _ in range(2):
+        csr = plugin.csr_metadata({}, content="csr")
+        assert csr == {"not_after": None, "subject_alt_name": ["DNS:host.example.com"]}
+
+    assert calls == [("community.crypto.openssl_csr_info", {"content": "csr"})]
@@ -0,0 +1,136 @@
+"""Tests for the file_bundle module and `ActionPluginMixin.transfer_files`.
+
+The actions are run through the `run_action` fixture, see conftest.py.
+"""
+
+import base64
+import hashlib
+import stat
+
+import pytest
+
+
+def sha1(content):
+    """Get the SHA1 checksum of `content`."""
+    return hashlib.sha1(content.encode()).hexdigest()
+
+
+def file_bundle(*files):
+    """Get an invocation of the file_bundle module for `files`."""
+    return ["network_automation_labs.devops.file_bundle", {"files": list(files)}]
+
+
+def test_stale_without_content(run_action, tmp_path):
+    """Test that differing files sent without content are only reported."""
+    current = tmp_path / "current.txt"
+    current.write_text("current")
+    outdated = tmp_path / "outdated.txt"
+    outdated.write_text("outdated")
+    missing = tmp_path / "missing.txt"
+
+    (result,) = run_action(
+        invocations=[
+            file_bundle(
+                {"path": str(current), "checksum": sha1("current")},
+                {"path": str(outdated), "checksum": sha1("new")},
+                {"path": str(missing), "checksum": sha1("new")},
+            )
+        ]
+    )["results"]
+
+    assert result["stale"] == [str(outdated), str(missing)]
+    assert result["updated"] == []
+    assert outdated.read_text() == "outdated"
+    assert not missing.exists()
+
+
+@pytest.mark.parametrize("compare_first", [True, False])
+def test_transfer_files(run_action, tmp_path, compare_first):
+    """Test that only differing files are staged and moved into place."""
+    current = tmp_path / "current.txt"
+    current.write_text("current")
+    outdated = tmp_path / "outdated.txt"
+    outdated.write_text("outdated")
+    missing = tmp_path / "missing.txt"
+
+    result = run_action(
+        transfer=[
+            {"dest": str(current), "content": "current"},
+            {"dest": str(outdated), "content": "new"},
+            {"dest": str(missing), "content": "new"},
+        ],
+        compare_first=compare_first,
+    )
+
+    assert result["changed"]
+    assert result["updated"] == [str(outdated), str(missing)]
+    assert outdated.read_text() == "new"
+    assert missing.read_text() == "new"
+    assert not list(tmp_path.glob(".ansible_tmp*"))
+
+    result = run_action(transfer=[{"dest": str(missing), "content": "new"}])
+    assert not result["changed"]
+
+
+def test_checksum_mismatch(run_action, tmp_path):
+    """Test that no file is replaced and staged files are removed on failure."""
+    first = tmp_path / "first.txt"
+    first.write_text("first")
+    second = tmp_path / "second.txt"
+
+    (result,) = run_action(
+        invocations=[
+            file_bundle(
+                {
+                    "path": str(first),
+                    "checksum": sha1("new"),
+                    "content": base64.b64encode(b"new").decode(),
+                },
+                {
+                    "path": str(second),
+                    "checksum": sha1("expected"),
+                    "content": base64.b64encode(b"corrupted").decode(),
+                },
+            )
+        ]
+    )["results"]
+
+    assert result["failed"]
+    assert "second.txt" in result["msg"]
+    assert first.read_text() == "first"
+    assert not second.exists()
+    assert not list(tmp_path.glob(".ansible_tmp*"))
+
+
+def test_mode(run_action, tmp_path):
+    """Test that the mode is applied to new and unchanged files."""
+    current = tmp_path / "current.txt"
+    current.write_text("current")
+    current.chmod(0o600)
+    missing = tmp_path / "missing.txt"
+
+    result = run_action(
+        transfer=[
+            {"dest": str(current), "content": "current", "mode": "0644"},
+            {"dest": str(missing), "content": "new", "mode": "0640"},
+        ]
+    )
+
+    assert result["changed"]
+    assert stat.S_IMODE(current.stat().st_mode) == 0o644
+    assert stat.S_IMODE(missing.stat().st_mode) == 0o640
+
+
+def test_check_mode(run_action, tmp_path):
+    """Test that check mode reports stale files without writing them."""
+    outdated = tmp_path / "outdated.txt"
+    outdated.write_text("outdated")
+
+    result = run_action(
+        transfer=[{"dest": str(outdated), "content": "new"}], check=True
+    )
+
+    assert result["changed"]
+    assert result["stale"] == [str(outdated)]
+    assert result["updated"] == []
+    assert outdated.read_text() == "outdated"
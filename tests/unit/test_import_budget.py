@@ -0,0 +1,83 @@
+"""Import time budget for the collection's plugins.
+
+Filter and action plugins are imported by every worker that needs them, so
+each one is imported in a fresh interpreter and its import time, excluding
+ansible itself, must stay within budget. The plugins import in 1-3 ms, while
+importing netaddr at the top level alone costs about 13 ms, so the budget is
+kept tight enough to catch a heavy dependency. The best of a few runs is
+compared to it to keep scheduling noise out.
+"""
+
+import json
+import os
+import pathlib
+import subprocess
+import sys
+
+import pytest
+
+COLLECTION_ROOT = pathlib.Path(__file__).resolve().parents[2]
+
+PACKAGE = "ansible_collections.network_automation_labs.devops.plugins"
+
+# Seconds allowed for importing a single plugin module
+IMPORT_BUDGET = 0.01
+
+# Number of fresh interpreters the best import time is taken from
+IMPORT_RUNS = 3
+
+PRELOAD = [
+    "ansible.errors",
+    "ansible.plugins.action",
+    "ansible.plugins.loader",
+    "ansible.utils.display",
+]
+
+SCRIPT = """
+import importlib, json, sys, time
+for name in {preload!r}:
+    importlib.import_module(name)
+start = time.perf_counter()
+importlib.import_module({module!r})
+elapsed = time.perf_counter() - start
+print(json.dumps({{"elapsed": elapsed, "modules": sorted(sys.modules)}}))
+"""
+
+
+def plugin_modules():
+    """Get the module names of all filter and action plugins."""
+    return [
+        f"{PACKAGE}.{plugin_type}.{path.stem}"
+        for plugin_type in ("filter", "action")
+        for path in sorted((COLLECTION_ROOT / "plugins" / plugin_type).glob("*.py"))
+        if path.stem != "__init__"
+    ]
+
+
+def import_plugin(collections_path, module):
+    """Import `module` in a fresh interpreter."""
+    env = {**os.environ, "PYTHONPATH": str(collections_path)}
+    output = subprocess.run(
+        [sys.executable, "-c", SCRIPT.format(preload=PRELOAD, module=module)],
+        env=env,
+        capture_output=True,
+        check=True,
+        text=True,
+    ).stdout
+    return json.loads(output)
+
+
+@pytest.mark.parametrize("module", plugin_modules())
+def test_import_budget(collections_path, record_property, module):
+    """Test that each plugin imports within the budget."""
+    elapsed = min(
+        import_plugin(collections_path, module)["elapsed"] for _ in range(IMPORT_RUNS)
+    )
+    record_property("import_seconds", elapsed)
+    assert elapsed < IMPORT_BUDGET
+
+
+def test_nft_filters_defer_netaddr(collections_path):
+    """Test that netaddr is only imported when a filter needs it."""
+    result = import_plugin(collections_path, f"{PACKAGE}.filter.nft_filters")
+    assert "netaddr" not in result["modules"]
@@ -0,0 +1,57 @@
+"""Tests for batched remote module execution.
+
+The batches are run through the `run_action` fixture, see conftest.py.
+"""
+
+import pytest
+
+
+def test_batch_runs_in_order(run_action, tmp_path):
+    """Test that every invocation returns its own parsed result."""
+    path = tmp_path / "file.txt"
+    path.write_text("content")
+
+    batch = run_action(
+        invocations=[
+            ["ansible.builtin.ping", {"data": "first"}],
+            ["ansible.builtin.stat", {"path": str(path)}],
+            ["ansible.builtin.ping", {"data": "last"}],
+        ]
+    )
+
+    first, stat, last = batch["results"]
+    assert first["ping"] == "first"
+    assert stat["stat"]["exists"]
+    assert last["ping"] == "last"
+
+
+@pytest.mark.parametrize("stop_on_failure", [True, False])
+def test_batch_stop_on_failure(run_action, tmp_path, stop_on_failure):
+    """Test that invocations after a failure are only skipped when requested."""
+    batch = run_action(
+        invocations=[
+            ["ansible.builtin.slurp", {"src": str(tmp_path / "missing")}],
+            ["ansible.builtin.ping", {}],
+        ],
+        stop_on_failure=stop_on_failure,
+    )
+
+    failed, ping = batch["results"]
+    assert failed["failed"]
+    if stop_on_failure:
+        assert ping["skipped"]
+    else:
+        assert ping["ping"] == "pong"
+
+
+@pytest.mark.parametrize("exists", [True, False])
+def test_load_file_if_exists(run_action, tmp_path, exists):
+    """Test that stat and slurp are batched for loading a file."""
+    path = tmp_path / "file.txt"
+    if exists:
+        path.write_text("content")
+
+    batch = run_action(load=str(path))
+
+    assert batch["loaded"] == exists
+    assert batch["content"] == ("content" if exists else None)
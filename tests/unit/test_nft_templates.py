@@ -0,0 +1,97 @@
+"""Tests for the dynamic set templates of the nft role.
+
+The rendered configuration is compiled with `nft -c` inside a new user and
+network namespace, so the checks neither need root nor touch the host's
+ruleset. The compile checks are skipped when `nft` or `unshare` are missing.
+"""
+
+import pathlib
+import shutil
+import subprocess
+
+import jinja2
+import pytest
+import yaml
+
+ROLE = pathlib.Path(__file__).resolve().parents[2] / "roles" / "nft"
+TEMPLATES = ROLE / "templates" / "etc" / "nftables.d"
+
+KNOCK_SEQUENCES = {
+    "single": [{"protocol": "tcp", "port": 7000}],
+    "multiple": [
+        {"protocol": "tcp", "port": 7000},
+        {"protocol": "udp", "port": 8000},
+        {"protocol": "tcp", "port": 9000},
+    ],
+}
+
+
+def render(template, **overrides):
+    """Render a template with the role defaults and `overrides`."""
+    with open(ROLE / "defaults" / "main.yml") as fh:
+        variables = yaml.safe_load(fh)
+    variables.update(overrides)
+
+    env = jinja2.Environment(
+        loader=jinja2.FileSystemLoader(TEMPLATES),
+        trim_blocks=True,
+        lstrip_blocks=True,
+        undefined=jinja2.StrictUndefined,
+    )
+    return env.get_template(template).render(**variables)
+
+
+def nft_check(tmp_path, config):
+    """Compile `config` with nft in a fresh network namespace."""
+    nft = shutil.which("nft")
+    unshare = shutil.which("unshare")
+    if nft is None or unshare is None:
+        pytest.skip("nft and unshare are required to compile the ruleset")
+
+    path = tmp_path / "nftables.conf"
+    path.write_text(config)
+    result = subprocess.run(
+        [unshare, "--user", "--map-root-user", "--net", nft, "-c", "-f", str(path)],
+        capture_output=True,
+        check=False,
+        text=True,
+    )
+    if result.returncode != 0 and "unshare" in result.stderr:
+        pytest.skip(f"unable to create a network namespace: {result.stderr}")
+    assert result.returncode == 0, result.stderr
+
+
+@pytest.mark.parametrize("ipv6", [True, False])
+@pytest.mark.parametrize("sequence", KNOCK_SEQUENCES)
+def test_knock(tmp_path, sequence, ipv6):
+    """Test that the knock sets are capped and the ruleset compiles."""
+    config = render(
+        "001-knock.conf.j2",
+        knock_sequence=KNOCK_SEQUENCES[sequence],
+        nftables_ipv6=ipv6,
+    )
+    assert config.count("size 4096") == (len(KNOCK_SEQUENCES[sequence]) + 2) * (
+        2 if ipv6 else 1
+    )
+    assert ("ip6 saddr" in config) == ipv6
+    assert "add @open_door {" in config
+    nft_check(tmp_path, config)
+
+
+@pytest.mark.parametrize("ipv6", [True, False])
+def test_upnp(tmp_path, ipv6):
+    """Test that the upnp sets are capped and the ruleset compiles."""
+    config = render("005-upnp.conf.j2", nftables_ipv6=ipv6)
+    assert config.count("size 4096") == (2 if ipv6 else 1)
+    assert ("@upnp_v6" in config) == ipv6
+    nft_check(tmp_path, config)
+
+
+def test_overridden_nftables_dict():
+    """Test that replacing the `nftables` dict keeps the dynamic set defaults."""
+    config = render(
+        "001-knock.conf.j2",
+        knock_sequence=KNOCK_SEQUENCES["single"],
+        nftables={"log_prefix": "FW"},
+    )
+    assert "limit rate over 10/second burst 20 packets" in config
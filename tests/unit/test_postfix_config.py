@@ -0,0 +1,104 @@
+"""Tests for the postfix_config action plugin."""
+
+import pytest
+
+
+@pytest.fixture
+def postfix_config(collection):
+    """Get the postfix_config action plugin module."""
+    return collection("action.postfix_config")
+
+
+def test_update_unchanged(postfix_config):
+    """Test that parameters with the same value are not reported."""
+    content = "# comment\nmyhostname = host.example.com\nrelayhost =\n"
+
+    updated, changed = postfix_config.update_main_cf(
+        content, {"myhostname": "host.example.com", "relayhost": ""}
+    )
+
+    assert updated == "# comment\nmyhostname = host.example.com\nrelayhost = \n"
+    assert changed == set()
+
+
+def test_update_trailing_whitespace(postfix_config):
+    """Test that trailing whitespace is not reported as a change."""
+    _, changed = postfix_config.update_main_cf(
+        "myhostname = host.example.com  \t\n", {"myhostname": "host.example.com"}
+    )
+
+    assert changed == set()
+
+
+def test_update_in_place(postfix_config):
+    """Test that changed parameters are replaced where they are defined."""
+    content = "myhostname = old.example.com\nmydomain = example.com\n"
+
+    updated, changed = postfix_config.update_main_cf(
+        content, {"myhostname": "new.example.com"}
+    )
+
+    assert updated == "myhostname = new.example.com\nmydomain = example.com\n"
+    assert changed == {"myhostname"}
+
+
+def test_update_continuation_lines(postfix_config):
+    """Test that the continuation lines of a replaced parameter are dropped."""
+    content = (
+        "smtpd_recipient_restrictions =\n"
+        "    permit_mynetworks,\n"
+        "\treject_unauth_destination\n"
+        "mydomain = example.com\n"
+        "    example.org\n"
+    )
+
+    updated, changed = postfix_config.update_main_cf(
+        content, {"smtpd_recipient_restrictions": "permit_mynetworks"}
+    )
+
+    assert updated == (
+        "smtpd_recipient_restrictions = permit_mynetworks\n"
+        "mydomain = example.com\n"
+        "    example.org\n"
+    )
+    assert changed == {"smtpd_recipient_restrictions"}
+
+
+def test_update_duplicate_keys(postfix_config):
+    """Test that later definitions of a parameter are removed."""
+    content = (
+        "myhostname = host.example.com\n"
+        "mydomain = example.com\n"
+        "myhostname = other.example.com\n"
+        "    continued\n"
+    )
+
+    updated, changed = postfix_config.update_main_cf(
+        content, {"myhostname": "host.example.com"}
+    )
+
+    assert updated == "myhostname = host.example.com\nmydomain = example.com\n"
+    assert changed == {"myhostname"}
+
+
+def test_update_append(postfix_config):
+    """Test that missing parameters are appended in the given order."""
+    updated, changed = postfix_config.update_main_cf(
+        "mydomain = example.com\n",
+        {"relayhost": "[smtp.example.com]:587", "inet_protocols": "all"},
+    )
+
+    assert updated == (
+        "mydomain = example.com\n"
+        "relayhost = [smtp.example.com]:587\n"
+        "inet_protocols = all\n"
+    )
+    assert changed == {"relayhost", "inet_protocols"}
+
+
+def test_update_empty(postfix_config):
+    """Test that an absent main.cf gets every parameter."""
+    updated, changed = postfix_config.update_main_cf("", {"inet_protocols": 4})
+
+    assert updated == "inet_protocols = 4\n"
+    assert changed == {"inet_protocols"}
@@ -0,0 +1,92 @@
+"""Tests for the utility filters."""
+
+import pytest
+
+
+@pytest.fixture
+def util_filters(collection):
+    """Get the utility filters module."""
+    return collection("filter.util_filters")
+
+
+def host(ipv4=None, ipv6=None, short=None):
+    """Get the hostvars of a host with the given default addresses."""
+    facts = {}
+    if ipv4 is not None:
+        facts["default_ipv4"] = {"address": ipv4} if ipv4 else {}
+    if ipv6 is not None:
+        facts["default_ipv6"] = {"address": ipv6} if ipv6 else {}
+    host_vars = {"ansible_facts": facts}
+    if short is not None:
+        host_vars["inventory_hostname_short"] = short
+    return host_vars
+
+
+def test_hosts_index_names(util_filters):
+    """Test that each address lists the short name and then the full name."""
+    hostvars = {"web.example.com": host(ipv4="192.0.2.10", short="web")}
+
+    assert util_filters.hosts_index(hostvars) == [
+        ("192.0.2.10", ["web", "web.example.com"])
+    ]
+
+
+def test_hosts_index_short_name_is_fqdn(util_filters):
+    """Test that a name is only listed once when it has no domain."""
+    hostvars = {"router": host(ipv4="192.0.2.1")}
+
+    assert util_filters.hosts_index(hostvars) == [("192.0.2.1", ["router"])]
+
+
+def test_hosts_index_without_facts(util_filters):
+    """Test that hosts without facts or default addresses are skipped."""
+    hostvars = {
+        "unreachable.example.com": {},
+        "no-address.example.com": host(ipv4="", ipv6=""),
+        "no-ipv4.example.com": host(ipv4="", ipv6="2001:db8::20"),
+    }
+
+    assert util_filters.hosts_index(hostvars) == [
+        ("2001:db8::20", ["no-ipv4", "no-ipv4.example.com"])
+    ]
+
+
+def test_hosts_index_merges_hosts(util_filters):
+    """Test that hosts sharing an address are merged into one entry."""
+    hostvars = {
+        "a.example.com": host(ipv4="192.0.2.10", ipv6="2001:db8::10"),
+        "b.example.com": host(ipv4="192.0.2.10", ipv6="2001:db8::10"),
+    }
+
+    assert util_filters.hosts_index(hostvars) == [
+        ("192.0.2.10", ["a", "a.example.com", "b", "b.example.com"]),
+        ("2001:db8::10", ["a", "a.example.com", "b", "b.example.com"]),
+    ]
+
+
+def test_hosts_index_order(util_filters):
+    """Test that IPv4 addresses come first and addresses sort numerically."""
+    hostvars = {
+        "c.example.com": host(ipv6="2001:db8::9"),
+        "b.example.com": host(ipv4="192.0.2.10", ipv6="2001:db8::10"),
+        "a.example.com": host(ipv4="192.0.2.9"),
+    }
+
+    assert [address for address, _ in util_filters.hosts_index(hostvars)] == [
+        "192.0.2.9",
+        "192.0.2.10",
+        "2001:db8::9",
+        "2001:db8::10",
+    ]
+
+
+def test_hosts_index_selected_hosts(util_filters):
+    """Test that only the given hosts are indexed."""
+    hostvars = {
+        "a.example.com": host(ipv4="192.0.2.1"),
+        "b.example.com": host(ipv4="192.0.2.2"),
+    }
+
+    assert util_filters.hosts_index(hostvars, ["b.example.com"]) == [
+        ("192.0.2.2", ["b", "b.example.com"])
+    ]